@@ -12,18 +12,57 @@ Output:
     Creates data/books.json with enriched book data including cover URLs.
 """
 
+import contextlib
 import csv
+import http.client
+import itertools
 import json
+import os
+import queue
 import random
+import re
+import sqlite3
+import ssl
 import sys
+import threading
 import time
-import urllib.request
 import urllib.parse
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import TypedDict, Optional
+from typing import Iterable, Iterator, NamedTuple, TypedDict, Optional
 from datetime import datetime
 
+USER_AGENT = "BookSatisfactionApp/1.0 (polite crawler)"
+
+# Responses worth retrying with backoff; anything else is treated as a definite answer
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Cover fetching is pure network wait, so threads are cheap; the cap keeps
+# us within what Open Library will tolerate from a single client
+DEFAULT_WORKERS = 5
+MAX_WORKERS = 50
+
+# Steady-state request rate shared by all workers, however many there are
+MAX_REQUESTS_PER_SECOND = 10
+
+# ISBNs per Open Library /api/books request
+BULK_CHUNK_SIZE = 100
+
+# Date formats StoryGraph has been seen to use, tried in order
+DATE_FORMATS = ["%Y-%m-%d", "%Y/%m/%d", "%d/%m/%Y", "%m/%d/%Y", "%B %d, %Y"]
+_YEAR_RE = re.compile(r'\b(19|20)\d{2}\b')
+
+# Rows sampled up front to work out which date format an export uses
+DATE_SAMPLE_SIZE = 20
+
+# clean_isbn keeps only digits and X (check digit), upper-casing x
+_ISBN_KEEP = set(b"0123456789Xx")
+_ISBN_DELETE = bytes(i for i in range(256) if i not in _ISBN_KEEP)
+_ISBN_TABLE = bytes.maketrans(b"x", b"X")
+
+# Found covers are cached forever; misses are retried after this long
+NEGATIVE_CACHE_TTL = 7 * 24 * 60 * 60
+
 
 class Book(TypedDict):
     id: str
@@ -41,163 +80,537 @@ def parse_date(date_str: str) -> tuple[Optional[int], Optional[str]]:
     Parse date string and return (year, full_date_iso).
     Full date is in YYYY-MM-DD format when available.
     """
-    if not date_str or date_str.strip() == "":
+    date_str = date_str.strip() if date_str else ""
+    if not date_str:
         return None, None
 
+    # Fast path for ISO dates, which skips strptime's format parsing
+    if len(date_str) == 10 and date_str[4] == "-":
+        try:
+            dt = datetime.fromisoformat(date_str)
+            return dt.year, dt.strftime("%Y-%m-%d")
+        except ValueError:
+            pass
+
     # Try common formats
-    formats = ["%Y-%m-%d", "%Y/%m/%d", "%d/%m/%Y", "%m/%d/%Y", "%B %d, %Y"]
-    for fmt in formats:
+    for fmt in DATE_FORMATS:
         try:
-            dt = datetime.strptime(date_str.strip(), fmt)
+            dt = datetime.strptime(date_str, fmt)
             return dt.year, dt.strftime("%Y-%m-%d")
         except ValueError:
             continue
 
     # Try year-only format
-    try:
-        dt = datetime.strptime(date_str.strip(), "%Y")
-        return dt.year, None  # No full date available
-    except ValueError:
-        pass
+    if len(date_str) == 4 and date_str.isdigit():
+        return int(date_str), None  # No full date available
 
     # Last resort: look for a 4-digit year anywhere in the string
-    import re
-    match = re.search(r'\b(19|20)\d{2}\b', date_str)
+    match = _YEAR_RE.search(date_str)
     if match:
         return int(match.group()), None
 
     return None, None
 
 
+def detect_date_format(date_strs: list[str]) -> Optional[str]:
+    """
+    Pick the DATE_FORMATS entry that parses the most sample values, so an
+    export's dates can be parsed with one strptime each. Ties go to the
+    earlier format; returns None if no format parses any value.
+    """
+    values = [d.strip() for d in date_strs if d and d.strip()]
+    best_fmt, best_count = None, 0
+
+    for fmt in DATE_FORMATS:
+        count = 0
+        for value in values:
+            try:
+                datetime.strptime(value, fmt)
+                count += 1
+            except ValueError:
+                pass
+        if count > best_count:
+            best_fmt, best_count = fmt, count
+
+    return best_fmt
+
+
+def _parse_date_fast(date_str: str, fmt: str) -> tuple[int, str]:
+    """Parse with a single known format. Raises ValueError if it doesn't match."""
+    date_str = date_str.strip()
+    if fmt == "%Y-%m-%d" and len(date_str) == 10:
+        # Same ISO fast path as parse_date
+        dt = datetime.fromisoformat(date_str)
+    else:
+        dt = datetime.strptime(date_str, fmt)
+    return dt.year, dt.strftime("%Y-%m-%d")
+
+
 def parse_year_from_date(date_str: str) -> Optional[int]:
     """Extract year from various date formats StoryGraph uses."""
     year, _ = parse_date(date_str)
     return year
 
 
-def fetch_cover_by_search(title: str, author: str, max_retries: int = 3) -> Optional[str]:
+class RetryableStatus(Exception):
+    """Raised when Open Library answers with a status worth retrying (429/5xx)."""
+
+
+# Failures worth backing off and retrying: throttling, server errors,
+# timeouts and dropped connections. Anything else is treated as a miss.
+RETRYABLE_ERRORS = (RetryableStatus, http.client.HTTPException, OSError)
+
+
+class CoverLookupError(Exception):
+    """Raised when a cover lookup gave up after retries, as opposed to finding no cover."""
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket. Each acquire() takes one token, blocking until
+    one is available, so workers share a single steady request rate instead
+    of bursting into 429s and retrying.
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        self.rate = rate
+        self.capacity = burst or max(1, int(rate))
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class Response(NamedTuple):
+    status: int
+    headers: http.client.HTTPMessage
+    body: bytes
+
+
+class Session:
+    """
+    Minimal keep-alive HTTP session shared by all cover-fetching workers.
+
+    Connections are pooled per host and handed back after each request, so
+    the TCP + TLS handshake to openlibrary.org is paid once per worker rather
+    than once per book. Safe to share between threads.
+    """
+
+    def __init__(self, pool_maxsize: int = 10, max_rate: float = MAX_REQUESTS_PER_SECOND):
+        self.pool_maxsize = pool_maxsize
+        self.limiter = RateLimiter(max_rate)
+        # One TLS context for every connection: http.client would otherwise
+        # build a fresh one (and reload the CA bundle) per connection
+        self._ssl_context = ssl.create_default_context()
+        self._pools: dict[tuple[str, str], queue.LifoQueue] = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "Session":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _pool(self, scheme: str, host: str) -> queue.LifoQueue:
+        with self._lock:
+            pool = self._pools.get((scheme, host))
+            if pool is None:
+                pool = self._pools[(scheme, host)] = queue.LifoQueue(self.pool_maxsize)
+            return pool
+
+    def _acquire(self, scheme: str, host: str, timeout: float) -> http.client.HTTPConnection:
+        try:
+            conn = self._pool(scheme, host).get_nowait()
+        except queue.Empty:
+            if scheme == "https":
+                conn = http.client.HTTPSConnection(host, timeout=timeout, context=self._ssl_context)
+            else:
+                conn = http.client.HTTPConnection(host, timeout=timeout)
+        conn.timeout = timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+        return conn
+
+    def _release(self, scheme: str, host: str, conn: http.client.HTTPConnection) -> None:
+        try:
+            self._pool(scheme, host).put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def _send(self, method: str, url: str, timeout: float) -> Response:
+        parts = urllib.parse.urlsplit(url)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+
+        self.limiter.acquire()
+
+        # A pooled connection may have been closed by the server while idle,
+        # so a failure on a reused socket gets one immediate retry on a fresh one
+        for fresh in (False, True):
+            conn = self._acquire(parts.scheme, parts.netloc, timeout)
+            reused = conn.sock is not None
+            try:
+                conn.request(method, path, headers={"User-Agent": USER_AGENT})
+                response = conn.getresponse()
+                body = response.read()
+            except (http.client.HTTPException, OSError):
+                conn.close()
+                if reused and not fresh:
+                    continue
+                raise
+
+            if response.will_close:
+                conn.close()
+            else:
+                self._release(parts.scheme, parts.netloc, conn)
+            return Response(response.status, response.headers, body)
+
+        raise AssertionError("unreachable")
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        timeout: float = 10,
+        follow_redirects: bool = True,
+        max_redirects: int = 5,
+    ) -> Response:
+        """Perform a request, raising RetryableStatus for 429/5xx responses."""
+        for _ in range(max_redirects + 1):
+            response = self._send(method, url, timeout)
+            if response.status in RETRY_STATUSES:
+                raise RetryableStatus(f"HTTP {response.status} from {url}")
+            location = response.headers.get("Location")
+            if follow_redirects and response.status in (301, 302, 303, 307, 308) and location:
+                url = urllib.parse.urljoin(url, location)
+                continue
+            return response
+        raise http.client.HTTPException(f"Too many redirects for {url}")
+
+    def get(self, url: str, **kwargs) -> Response:
+        return self.request("GET", url, **kwargs)
+
+    def head(self, url: str, **kwargs) -> Response:
+        return self.request("HEAD", url, **kwargs)
+
+    def close(self) -> None:
+        with self._lock:
+            pools = list(self._pools.values())
+            self._pools.clear()
+        for pool in pools:
+            while True:
+                try:
+                    pool.get_nowait().close()
+                except queue.Empty:
+                    break
+
+
+class CoverCache:
+    """
+    On-disk SQLite cache of cover lookups, so re-runs only hit the network
+    for books we have not seen before. Safe to share between threads.
+    """
+
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS covers (key TEXT PRIMARY KEY, url TEXT, fetched_at INT)"
+            )
+
+    def __enter__(self) -> "CoverCache":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @staticmethod
+    def key_for(book: Book) -> str:
+        if book["isbn"]:
+            return f"isbn:{book['isbn']}"
+        return f"search:{book['title']}|{book['authors']}"
+
+    def get(self, key: str) -> tuple[bool, Optional[str]]:
+        """Return (hit, cover_url). Misses older than NEGATIVE_CACHE_TTL don't count as hits."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, fetched_at FROM covers WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return False, None
+        url, fetched_at = row
+        if url is None and time.time() - fetched_at > NEGATIVE_CACHE_TTL:
+            return False, None
+        return True, url
+
+    def set(self, key: str, url: Optional[str]) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO covers (key, url, fetched_at) VALUES (?, ?, ?)",
+                (key, url, int(time.time())),
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def fetch_cover_by_search(session: Session, title: str, author: str, max_retries: int = 3) -> Optional[str]:
     """
     Search Open Library for a cover by title/author.
-    Uses exponential backoff with jitter for polite retrying.
+    Uses exponential backoff with jitter for polite retrying, and raises
+    CoverLookupError if every attempt fails.
     """
     query = urllib.parse.quote(f"{title} {author}")
-    search_url = f"https://openlibrary.org/search.json?q={query}&limit=1"
+    # Only ask for the fields we read; a full search doc is tens of KB
+    search_url = f"https://openlibrary.org/search.json?q={query}&limit=1&fields=cover_i,isbn"
 
     for attempt in range(max_retries):
         try:
-            req = urllib.request.Request(
-                search_url,
-                headers={"User-Agent": "BookSatisfactionApp/1.0 (polite crawler)"}
-            )
-            with urllib.request.urlopen(req, timeout=10) as response:
-                data = json.loads(response.read().decode())
-
-                if data.get("docs") and len(data["docs"]) > 0:
-                    doc = data["docs"][0]
-                    if "cover_i" in doc:
-                        return f"https://covers.openlibrary.org/b/id/{doc['cover_i']}-M.jpg"
-                    if "isbn" in doc and doc["isbn"]:
-                        return f"https://covers.openlibrary.org/b/isbn/{doc['isbn'][0]}-M.jpg"
+            response = session.get(search_url, timeout=10)
+            if response.status != 200:
+                return None
+
+            data = json.loads(response.body)
+
+            if data.get("docs") and len(data["docs"]) > 0:
+                doc = data["docs"][0]
+                if "cover_i" in doc:
+                    return f"https://covers.openlibrary.org/b/id/{doc['cover_i']}-M.jpg"
+                if "isbn" in doc and doc["isbn"]:
+                    return f"https://covers.openlibrary.org/b/isbn/{doc['isbn'][0]}-M.jpg"
             return None
 
-        except Exception as e:
+        except RETRYABLE_ERRORS as e:
             if attempt < max_retries - 1:
                 # Exponential backoff with jitter: 1s, 2s, 4s base + random 0-1s
                 delay = (2 ** attempt) + random.random()
                 time.sleep(delay)
             else:
-                return None
+                raise CoverLookupError(f"Search failed for {title!r}") from e
+        except Exception:
+            return None  # malformed response; retrying won't fix it
 
     return None
 
 
-def verify_isbn_cover(isbn: str, max_retries: int = 2) -> Optional[str]:
+def verify_isbn_cover(session: Session, isbn: str, max_retries: int = 2) -> Optional[str]:
     """
     Check if an ISBN has a real cover (not a 1x1 placeholder).
     Returns the URL if valid, None otherwise.
+    Raises CoverLookupError if every attempt fails.
     """
     url = f"https://covers.openlibrary.org/b/isbn/{isbn}-M.jpg"
 
     for attempt in range(max_retries):
         try:
-            req = urllib.request.Request(
-                url,
-                method='HEAD',
-                headers={"User-Agent": "BookSatisfactionApp/1.0 (polite crawler)"}
-            )
-            with urllib.request.urlopen(req, timeout=5) as response:
-                # Open Library returns a tiny image (< 1KB) for missing covers
-                content_length = response.headers.get('Content-Length', '0')
-                if int(content_length) > 1000:  # Real covers are > 1KB
-                    return url
+            # default=false makes Open Library 404 instead of serving a placeholder,
+            # so the status code alone tells us whether a cover exists
+            response = session.head(f"{url}?default=false", timeout=5, follow_redirects=False)
+            if response.status in (200, 302):
+                return url
             return None
-        except Exception:
+        except RETRYABLE_ERRORS as e:
             if attempt < max_retries - 1:
                 delay = (2 ** attempt) + random.random()
                 time.sleep(delay)
+            else:
+                raise CoverLookupError(f"Cover check failed for ISBN {isbn}") from e
+        except Exception:
+            return None  # unexpected response; count it as a miss
     return None
 
 
-def fetch_cover_for_book(book: Book) -> tuple[str, Optional[str]]:
+def fetch_covers_bulk(session: Session, isbns: list[str], max_retries: int = 3) -> dict[str, Optional[str]]:
+    """
+    Look up covers for many ISBNs at once via Open Library's books API.
+
+    Returns a mapping of ISBN -> medium cover URL, or None when Open Library
+    answered but has no cover for that ISBN. ISBNs from chunks that failed
+    after all retries are left out so callers can fall back to per-book lookups.
+    """
+    covers: dict[str, Optional[str]] = {}
+
+    for start in range(0, len(isbns), BULK_CHUNK_SIZE):
+        chunk = isbns[start:start + BULK_CHUNK_SIZE]
+        query = urllib.parse.urlencode({
+            "bibkeys": ",".join(f"ISBN:{isbn}" for isbn in chunk),
+            "format": "json",
+            "jscmd": "data",
+        })
+        url = f"https://openlibrary.org/api/books?{query}"
+
+        for attempt in range(max_retries):
+            try:
+                response = session.get(url, timeout=30)
+                if response.status != 200:
+                    break
+
+                data = json.loads(response.body)
+                for isbn in chunk:
+                    record = data.get(f"ISBN:{isbn}") or {}
+                    covers[isbn] = record.get("cover", {}).get("medium")
+                break
+
+            except RETRYABLE_ERRORS:
+                if attempt < max_retries - 1:
+                    delay = (2 ** attempt) + random.random()
+                    time.sleep(delay)
+            except Exception:
+                break  # malformed response; leave this chunk to per-book lookups
+
+    return covers
+
+
+def start_cover_lookup(
+    executor: ThreadPoolExecutor, session: Session, book: Book, verify_isbn: bool = True
+) -> tuple[Future, Optional[Future]]:
+    """
+    Start fetching a book's cover. Returns (primary, fallback) futures.
+
+    When the ISBN needs verifying, the HEAD check is primary and the
+    title/author search is started alongside it as the fallback, so an ISBN
+    without a cover doesn't cost a second sequential round-trip. Pass
+    verify_isbn=False when the ISBN is already known to have no cover.
+    """
+    search = executor.submit(fetch_cover_by_search, session, book["title"], book["authors"])
+    if book["isbn"] and verify_isbn:
+        return executor.submit(verify_isbn_cover, session, book["isbn"]), search
+    return search, None
+
+
+def finish_cover_lookup(primary: Future, fallback: Optional[Future]) -> Optional[str]:
     """
-    Fetch cover URL for a single book. Returns (book_id, cover_url).
-    Verifies ISBN covers exist, falls back to search if not.
+    Return the primary result if it found a cover, otherwise the fallback's.
+
+    Raises CoverLookupError unless we got a definite answer: a cover from
+    either lookup, or a miss from both.
     """
-    # Try ISBN first
-    if book["isbn"]:
-        cover_url = verify_isbn_cover(book["isbn"])
-        if cover_url:
-            return (book["id"], cover_url)
+    try:
+        cover_url = primary.result()
+        primary_failed = False
+    except CoverLookupError:
+        if fallback is None:
+            raise
+        cover_url, primary_failed = None, True
+
+    if fallback is None:
+        return cover_url
+    if cover_url:
+        fallback.cancel()  # only stops it if it hasn't started yet
+        return cover_url
+
+    cover_url = fallback.result()
+    if cover_url is None and primary_failed:
+        raise CoverLookupError("ISBN check failed and search found no cover")
+    return cover_url
+
+
+def is_valid_isbn(isbn: str) -> bool:
+    """Check the ISBN-10 (mod 11) or ISBN-13 (mod 10) check digit."""
+    if len(isbn) == 10:
+        if not isbn[:9].isdigit() or not (isbn[9].isdigit() or isbn[9] == "X"):
+            return False
+        digits = [int(c) for c in isbn[:9]] + [10 if isbn[9] == "X" else int(isbn[9])]
+        return sum(i * d for i, d in enumerate(digits, 1)) % 11 == 0
+
+    if len(isbn) == 13:
+        if not isbn.isdigit():
+            return False
+        return sum(int(c) * (3 if i % 2 else 1) for i, c in enumerate(isbn)) % 10 == 0
 
-    # Fall back to search
-    cover_url = fetch_cover_by_search(book["title"], book["authors"])
-    return (book["id"], cover_url)
+    return False
 
 
 def clean_isbn(isbn_str: Optional[str]) -> Optional[str]:
-    """Clean and validate ISBN string."""
+    """
+    Clean and validate ISBN string. ISBNs with a bad check digit are
+    rejected here, so we never spend a request proving them wrong.
+    """
     if not isbn_str:
         return None
 
-    cleaned = "".join(c for c in isbn_str if c.isdigit() or c.upper() == "X")
+    cleaned = isbn_str.encode("ascii", "ignore").translate(_ISBN_TABLE, delete=_ISBN_DELETE).decode()
 
-    if len(cleaned) in (10, 13):
+    if is_valid_isbn(cleaned):
         return cleaned
 
     return None
 
 
-def process_csv(csv_path: Path) -> list[Book]:
-    """Process StoryGraph CSV and return list of books."""
-    books: list[Book] = []
-
+def process_csv(csv_path: Path) -> Iterator[Book]:
+    """Process StoryGraph CSV, yielding read books one row at a time."""
     with open(csv_path, "r", encoding="utf-8-sig") as f:
-        reader = csv.DictReader(f)
-
-        fieldnames = reader.fieldnames or []
+        # Plain csv.reader rows (lists) are cheaper than a dict per row;
+        # blank lines are skipped like DictReader does, so book ids don't shift
+        reader = csv.reader(f)
+        fieldnames = next(reader, [])
         print(f"Found columns: {fieldnames}", file=sys.stderr)
 
-        for i, row in enumerate(reader):
-            def get_col(possible_names: list[str]) -> str:
-                for name in possible_names:
-                    for col in row.keys():
-                        if col.lower().strip() == name.lower():
-                            return row[col]
-                return ""
-
-            title = get_col(["title", "book title"])
-            authors = get_col(["authors", "author", "author(s)"])
-            read_status = get_col(["read status", "status", "exclusive shelf"])
-            date_read = get_col(["last date read", "date read", "dates read", "date finished"])
-            isbn = get_col(["isbn/uid", "isbn", "isbn13", "isbn-13"])
-            book_format = get_col(["format", "binding"])
-
-            if read_status.lower() not in ["read", "finished"]:
+        # Resolve each field to its column index once, rather than scanning
+        # every column for every candidate name on every row
+        col_map: dict[str, int] = {}
+        for index, col in enumerate(fieldnames):
+            col_map.setdefault(col.lower().strip(), index)
+
+        def find_col(possible_names: list[str]) -> Optional[int]:
+            return next((col_map[name] for name in possible_names if name in col_map), None)
+
+        title_col = find_col(["title", "book title"])
+        authors_col = find_col(["authors", "author", "author(s)"])
+        read_status_col = find_col(["read status", "status", "exclusive shelf"])
+        date_read_col = find_col(["last date read", "date read", "dates read", "date finished"])
+        dates_read_col = find_col(["dates read"])
+        isbn_col = find_col(["isbn/uid", "isbn", "isbn13", "isbn-13"])
+        format_col = find_col(["format", "binding"])
+
+        def get_col(row: list[str], col: Optional[int]) -> str:
+            return row[col] if col is not None and col < len(row) else ""
+
+        # Look at the first few rows to find the export's date format, then
+        # parse every row with that one format before trying the others
+        rows = (row for row in reader if row)
+        sample = list(itertools.islice(rows, DATE_SAMPLE_SIZE))
+        date_fmt = detect_date_format([get_col(row, date_read_col) for row in sample])
+
+        for i, row in enumerate(itertools.chain(sample, rows)):
+            # Filter on status before pulling out anything else
+            read_status = get_col(row, read_status_col)
+            if read_status.lower() not in ("read", "finished"):
                 continue
 
-            year, full_date = parse_date(date_read)
+            title = get_col(row, title_col)
+            authors = get_col(row, authors_col)
+            date_read = get_col(row, date_read_col)
+            isbn = get_col(row, isbn_col)
+            book_format = get_col(row, format_col)
+
+            year, full_date = None, None
+            if date_fmt and date_read:
+                try:
+                    year, full_date = _parse_date_fast(date_read, date_fmt)
+                except ValueError:
+                    pass
             if not year:
-                dates_read = get_col(["dates read"])
+                year, full_date = parse_date(date_read)
+            if not year:
+                dates_read = get_col(row, dates_read_col)
                 if dates_read:
                     parts = dates_read.split("-")
                     year, full_date = parse_date(parts[-1].strip())
@@ -219,49 +632,148 @@ def process_csv(csv_path: Path) -> list[Book]:
                 "format": book_format.strip() if book_format else None,
             }
 
-            books.append(book)
+            yield book
+
 
-    return books
+_END = object()
 
 
-def enrich_with_covers(books: list[Book], max_workers: int = 10) -> list[Book]:
+def _read_ahead(items: Iterable[Book], maxsize: int) -> Iterator[Book]:
     """
-    Add cover URLs to books using parallel requests.
+    Iterate over items while a background thread produces the next ones,
+    buffering at most maxsize of them. Lets CSV parsing run while cover
+    requests are waiting on the network.
+    """
+    buffer: queue.Queue = queue.Queue(maxsize)
+    stop = threading.Event()
+    errors: list[BaseException] = []
+
+    def put(item) -> bool:
+        # Time out periodically so we notice if the consumer has gone away
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
 
-    All books are verified - ISBN covers are checked via HEAD request,
-    missing ones fall back to search.
+    def produce() -> None:
+        try:
+            for item in items:
+                if not put(item):
+                    return
+        except BaseException as e:
+            errors.append(e)
+        put(_END)
+
+    threading.Thread(target=produce, daemon=True).start()
+    try:
+        while (item := buffer.get()) is not _END:
+            yield item
+        if errors:
+            raise errors[0]
+    finally:
+        stop.set()
+
+
+def _enrich_batch(
+    batch: list[Book], session: Session, executor: ThreadPoolExecutor, cache: Optional[CoverCache]
+) -> None:
     """
-    total = len(books)
-    books_with_isbn = sum(1 for b in books if b["isbn"])
+    Fill in cover_url for one batch of books in place.
 
-    print(f"  {books_with_isbn} books have ISBNs (will verify)", file=sys.stderr)
-    print(f"  {total - books_with_isbn} books need search", file=sys.stderr)
-    print(f"  Using {max_workers} parallel workers", file=sys.stderr)
+    Books already in the cache are filled in without any network traffic.
+    The remaining ISBNs are looked up in a single bulk request. Books the
+    bulk lookup has no cover for fall back to search; books whose bulk
+    request failed outright are verified individually via HEAD request,
+    with the search running alongside in case the ISBN has no cover.
+    """
+    # One pass: fill cache hits and collect the ISBNs still to look up
+    to_fetch: list[Book] = []
+    isbn_set: set[str] = set()
+    for book in batch:
+        if cache:
+            hit, cover_url = cache.get(CoverCache.key_for(book))
+            if hit:
+                book["cover_url"] = cover_url
+                continue
+        to_fetch.append(book)
+        if book["isbn"]:
+            isbn_set.add(book["isbn"])
+
+    isbns = sorted(isbn_set)
+    bulk_covers = fetch_covers_bulk(session, isbns) if isbns else {}
+
+    remaining: list[Book] = []
+    for book in to_fetch:
+        if book["isbn"] and bulk_covers.get(book["isbn"]):
+            book["cover_url"] = bulk_covers[book["isbn"]]
+            if cache:
+                cache.set(CoverCache.key_for(book), book["cover_url"])
+        else:
+            remaining.append(book)
+
+    # Books needing the exact same requests (re-reads, duplicate rows) share
+    # one lookup; ISBNs the bulk lookup answered for have no cover, so those
+    # go straight to search
+    groups: dict[tuple[Optional[str], str, str], list[Book]] = {}
+    for book in remaining:
+        isbn_to_verify = book["isbn"] if book["isbn"] not in bulk_covers else None
+        groups.setdefault((isbn_to_verify, book["title"], book["authors"]), []).append(book)
+
+    lookups = {}
+    for (isbn_to_verify, _, _), books in groups.items():
+        primary, fallback = start_cover_lookup(executor, session, books[0], isbn_to_verify is not None)
+        lookups[primary] = (books, fallback)
+
+    for primary in as_completed(lookups):
+        books, fallback = lookups[primary]
+        try:
+            cover_url = finish_cover_lookup(primary, fallback)
+        except CoverLookupError:
+            # Network trouble, not a missing cover: don't cache, retry next run
+            continue
+        for book in books:
+            book["cover_url"] = cover_url
+            if cache:
+                cache.set(CoverCache.key_for(book), cover_url)
 
-    book_lookup = {b["id"]: b for b in books}
-    completed = 0
 
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = {
-            executor.submit(fetch_cover_for_book, book): book
-            for book in books
-        }
+def enrich_with_covers(
+    books: Iterable[Book], max_workers: int = 10, cache: Optional[CoverCache] = None
+) -> Iterator[Book]:
+    """
+    Add cover URLs to books using parallel requests.
 
-        for future in as_completed(futures):
-            book_id, cover_url = future.result()
-            book_lookup[book_id]["cover_url"] = cover_url
-            completed += 1
+    Books are consumed and yielded in batches of BULK_CHUNK_SIZE, in their
+    original order, so only one batch (plus one read-ahead batch) is held
+    in memory while its covers are fetched.
+    """
+    print(f"  Using {max_workers} parallel workers", file=sys.stderr)
+
+    # Keep parsing the next batch while this one is being fetched
+    books = _read_ahead(books, maxsize=BULK_CHUNK_SIZE)
+    completed = 0
 
-            if completed % 50 == 0 or completed == total:
-                print(f"  Processed {completed}/{total} books...", file=sys.stderr)
+    # One session for all workers: keep-alive connections are reused across books
+    with Session(pool_maxsize=max_workers) as session, \
+            ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while batch := list(itertools.islice(books, BULK_CHUNK_SIZE)):
+            _enrich_batch(batch, session, executor, cache)
+            yield from batch
 
-    return books
+            completed += len(batch)
+            print(f"  Processed {completed} books...", file=sys.stderr)
 
 
 def main():
     if len(sys.argv) < 2:
         print("Usage: uv run process_csv.py path/to/storygraph_export.csv", file=sys.stderr)
         print("\nThis will create data/books.json with your processed reading data.", file=sys.stderr)
+        print("\nOptions:", file=sys.stderr)
+        print("  --no-covers    Skip fetching cover images", file=sys.stderr)
+        print(f"  --workers N    Parallel cover requests (default {DEFAULT_WORKERS}, max {MAX_WORKERS})", file=sys.stderr)
         sys.exit(1)
 
     csv_path = Path(sys.argv[1])
@@ -269,40 +781,68 @@ def main():
         print(f"Error: File not found: {csv_path}", file=sys.stderr)
         sys.exit(1)
 
+    max_workers = DEFAULT_WORKERS
+    if "--workers" in sys.argv:
+        try:
+            max_workers = int(sys.argv[sys.argv.index("--workers") + 1])
+        except (IndexError, ValueError):
+            print("Error: --workers expects a number", file=sys.stderr)
+            sys.exit(1)
+        if not 1 <= max_workers <= MAX_WORKERS:
+            print(f"Error: --workers must be between 1 and {MAX_WORKERS}", file=sys.stderr)
+            sys.exit(1)
+
     output_dir = Path(__file__).parent / "data"
     output_dir.mkdir(exist_ok=True)
     output_path = output_dir / "books.json"
 
     print(f"Processing: {csv_path}", file=sys.stderr)
 
-    # Step 1: Parse CSV
+    # Books stream through parsing -> cover fetching -> JSON output, so a large
+    # export is never held in memory all at once
     print("\n[1/2] Parsing CSV...", file=sys.stderr)
     books = process_csv(csv_path)
-    print(f"  Found {len(books)} read books", file=sys.stderr)
 
-    if not books:
-        print("Error: No books found. Check that your CSV has 'read' status books.", file=sys.stderr)
-        sys.exit(1)
-
-    # Step 2: Fetch cover URLs
     print("\n[2/2] Fetching cover images...", file=sys.stderr)
     skip_covers = "--no-covers" in sys.argv
     if skip_covers:
         print("  Skipping cover fetch (--no-covers flag)", file=sys.stderr)
-    else:
-        books = enrich_with_covers(books, max_workers=5)
 
-    # Write output
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(books, f, indent=2, ensure_ascii=False)
+    # Write to a temp file and swap it in at the end, so a failed run
+    # never leaves a truncated books.json behind
+    tmp_path = output_path.with_suffix(".json.tmp")
+    count = 0
+    years: set[int] = set()
+    books_with_covers = 0
+
+    cache_context = contextlib.nullcontext() if skip_covers else CoverCache(output_dir / "cover_cache.sqlite")
+    with cache_context as cache:
+        if not skip_covers:
+            books = enrich_with_covers(books, max_workers=max_workers, cache=cache)
+
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write("[")
+            for book in books:
+                f.write(",\n  " if count else "\n  ")
+                f.write(json.dumps(book, indent=2, ensure_ascii=False).replace("\n", "\n  "))
+                count += 1
+                years.add(book["year_read"])
+                if book["cover_url"]:
+                    books_with_covers += 1
+            f.write("\n]" if count else "]")
+
+    if not count:
+        tmp_path.unlink()
+        print("Error: No books found. Check that your CSV has 'read' status books.", file=sys.stderr)
+        sys.exit(1)
+
+    os.replace(tmp_path, output_path)
 
-    print(f"\n✓ Saved {len(books)} books to: {output_path}", file=sys.stderr)
+    print(f"\n✓ Saved {count} books to: {output_path}", file=sys.stderr)
 
     # Summary stats
-    years = sorted(set(b["year_read"] for b in books))
     print(f"  Years covered: {min(years)} - {max(years)}", file=sys.stderr)
-    books_with_covers = sum(1 for b in books if b["cover_url"])
-    print(f"  Books with covers: {books_with_covers}/{len(books)}", file=sys.stderr)
+    print(f"  Books with covers: {books_with_covers}/{count}", file=sys.stderr)
 
 
 if __name__ == "__main__":
@@ -1,15 +1,100 @@
 #!/usr/bin/env python3
 """
 Simple server that serves static files AND saves ratings to disk.
-Ratings are saved to data/ratings.json on every update.
+Every rating is appended to data/ratings.jsonl; data/ratings.json is
+rewritten from memory every COMPACT_EVERY ratings and on shutdown.
 """
 
 import json
 import os
-from http.server import HTTPServer, SimpleHTTPRequestHandler
+import signal
+import sys
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 
 RATINGS_FILE = Path(__file__).parent / "data" / "ratings.json"
+RATINGS_LOG = Path(__file__).parent / "data" / "ratings.jsonl"
+
+# Rewrite ratings.json from memory after this many logged ratings
+COMPACT_EVERY = 500
+
+
+class RatingServer(ThreadingHTTPServer):
+    """
+    Threaded HTTPServer that keeps ratings in memory and persists them via
+    an append-only log, so saving a rating costs one line instead of a full
+    rewrite of ratings.json. `lock` guards `ratings` and the log file.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lock = threading.Lock()
+        self.ratings: dict[str, str] = self._load_ratings()
+        self.writes_since_compaction = 0
+        # Fold any log left over from a previous run into ratings.json
+        self.compact()
+
+    @staticmethod
+    def _load_ratings() -> dict[str, str]:
+        ratings = {}
+        if RATINGS_FILE.exists():
+            with open(RATINGS_FILE, "r") as f:
+                ratings = json.load(f)
+
+        # Replay ratings logged since the last compaction; later lines win
+        if RATINGS_LOG.exists():
+            with open(RATINGS_LOG, "r") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # torn final line from a crash mid-write
+                    ratings[entry["book_id"]] = entry["rating"]
+
+        return ratings
+
+    def record(self, book_id: str, rating: str) -> int:
+        """Store a rating in memory and durably append it to the log. Returns the new total."""
+        line = json.dumps({"book_id": book_id, "rating": rating}) + "\n"
+
+        with self.lock:
+            self.ratings[book_id] = rating
+
+            with open(RATINGS_LOG, "a") as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+
+            self.writes_since_compaction += 1
+            if self.writes_since_compaction >= COMPACT_EVERY:
+                self._compact()
+
+            return len(self.ratings)
+
+    def snapshot(self) -> dict[str, str]:
+        """Return a copy of the ratings that is safe to use outside the lock."""
+        with self.lock:
+            return dict(self.ratings)
+
+    def compact(self) -> None:
+        """Atomically rewrite ratings.json from memory and truncate the log."""
+        with self.lock:
+            self._compact()
+
+    def _compact(self) -> None:
+        RATINGS_FILE.parent.mkdir(parents=True, exist_ok=True)
+        if self.ratings or RATINGS_FILE.exists():
+            tmp_file = RATINGS_FILE.with_suffix(".json.tmp")
+            with open(tmp_file, "w") as f:
+                json.dump(self.ratings, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, RATINGS_FILE)
+
+        # Only safe to drop the log once ratings.json holds everything in it
+        RATINGS_LOG.unlink(missing_ok=True)
+        self.writes_since_compaction = 0
 
 
 class RatingHandler(SimpleHTTPRequestHandler):
@@ -25,7 +110,7 @@ class RatingHandler(SimpleHTTPRequestHandler):
         try:
             content_length = int(self.headers.get("Content-Length", 0))
             body = self.rfile.read(content_length)
-            data = json.loads(body.decode("utf-8"))
+            data = json.loads(body)
 
             # Validate the data structure
             if "book_id" not in data or "rating" not in data:
@@ -36,34 +121,57 @@ class RatingHandler(SimpleHTTPRequestHandler):
                 self.send_error(400, "Rating must be 'yes', 'no', or 'skip'")
                 return
 
-            # Load existing ratings
-            ratings = {}
-            if RATINGS_FILE.exists():
-                with open(RATINGS_FILE, "r") as f:
-                    ratings = json.load(f)
-
-            # Update with new rating
-            ratings[data["book_id"]] = data["rating"]
-
-            # Save back to file
-            RATINGS_FILE.parent.mkdir(parents=True, exist_ok=True)
-            with open(RATINGS_FILE, "w") as f:
-                json.dump(ratings, f, indent=2)
+            total = self.server.record(data["book_id"], data["rating"])
 
             # Send success response
             self.send_response(200)
             self.send_header("Content-Type", "application/json")
             self.send_header("Access-Control-Allow-Origin", "*")
             self.end_headers()
-            self.wfile.write(json.dumps({"status": "ok", "total_ratings": len(ratings)}).encode())
+            self.wfile.write(json.dumps({"status": "ok", "total_ratings": total}).encode())
 
-            print(f"  ✓ Saved rating: {data['book_id']} = {data['rating']} ({len(ratings)} total)")
+            print(f"  ✓ Saved rating: {data['book_id']} = {data['rating']} ({total} total)")
 
         except json.JSONDecodeError:
             self.send_error(400, "Invalid JSON")
         except Exception as e:
             self.send_error(500, str(e))
 
+    def do_GET(self):
+        # ratings.json on disk lags the log between compactions, so serve
+        # the live in-memory ratings instead
+        if self.path.split("?", 1)[0] == "/data/ratings.json":
+            self._send_ratings()
+        else:
+            super().do_GET()
+
+    def _send_ratings(self):
+        ratings = self.server.snapshot()
+        if not ratings:
+            # Same as a missing file, so the frontend falls back to localStorage
+            self.send_error(404, "No ratings yet")
+            return
+
+        # No indent: lets json use its C encoder, and the browser doesn't care
+        body = json.dumps(ratings, separators=(",", ":")).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def copyfile(self, source, outputfile):
+        # Static files are real files, so let the kernel copy them straight
+        # to the socket (sendfile) instead of through userspace buffers.
+        # Directory listings are in-memory and take the normal path.
+        try:
+            source.fileno()
+        except (AttributeError, OSError):
+            super().copyfile(source, outputfile)
+            return
+        self.connection.sendfile(source)
+
     def do_OPTIONS(self):
         """Handle CORS preflight requests."""
         self.send_response(200)
@@ -82,20 +190,23 @@ def main():
     port = 8000
     server_address = ("0.0.0.0", port)
 
-    # Load existing ratings count
-    rating_count = 0
-    if RATINGS_FILE.exists():
-        with open(RATINGS_FILE, "r") as f:
-            rating_count = len(json.load(f))
+    httpd = RatingServer(server_address, RatingHandler)
 
     print(f"\n📚 Book Rating Server")
     print(f"   Local:   http://localhost:{port}")
     print(f"   Network: http://0.0.0.0:{port}")
-    print(f"   Ratings: {RATINGS_FILE} ({rating_count} saved)")
+    print(f"   Ratings: {RATINGS_FILE} ({len(httpd.ratings)} saved)")
     print(f"\n   Press Ctrl+C to stop\n")
 
-    httpd = HTTPServer(server_address, RatingHandler)
-    httpd.serve_forever()
+    # Turn SIGTERM into a normal exit so the final compaction still runs
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.compact()
+        httpd.server_close()
 
 
 if __name__ == "__main__":